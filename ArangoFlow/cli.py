@@ -0,0 +1,132 @@
+"""
+Command line interface
+
+arangoflow pipeline.py                     #loads the pipeline and runs it
+arangoflow pipeline.py:build_fct --dry-run #only builds the graph in memory and prints its shape
+
+A pipeline module must define a function (by default named "pipeline") that takes a FlowProject as
+its only argument and creates the processes of the project.
+"""
+
+import argparse
+import sys
+
+from . import consts
+
+DEFAULT_PIPELINE_FUNCTION = "pipeline"
+
+def is_pipeline_file(path) :
+    """True if the pipeline path is a python file rather than a module name"""
+    import os
+    return path.endswith(".py") or os.path.isfile(path)
+
+def pipeline_name(target) :
+    """the name of the pipeline: the file name without extension or the module name"""
+    import os
+
+    path = target.partition(":")[0]
+    if is_pipeline_file(path) :
+        return os.path.splitext(os.path.basename(path))[0]
+    return path
+
+def load_pipeline(target) :
+    """loads the pipeline function from a target of the form: module_or_file[:function]"""
+    import importlib
+    import importlib.util
+    import os
+
+    path, _, fct_name = target.partition(":")
+    if fct_name == "" :
+        fct_name = DEFAULT_PIPELINE_FUNCTION
+
+    if is_pipeline_file(path) :
+        spec = importlib.util.spec_from_file_location(pipeline_name(target), path)
+        if spec is None :
+            raise ImportError("Unable to load pipeline file: %s" % path)
+        module = importlib.util.module_from_spec(spec)
+        sys.path.insert(0, os.path.dirname(os.path.abspath(path)))
+        spec.loader.exec_module(module)
+    else :
+        module = importlib.import_module(path)
+
+    try :
+        return getattr(module, fct_name)
+    except AttributeError :
+        raise AttributeError("Pipeline module %s has no function named: %s" % (path, fct_name))
+
+def connect(url, username, password, db_name) :
+    """connects to ArangoDB and returns the database, creates it if needed"""
+    import pyArango.connection as ADB
+
+    connection = ADB.Connection(arangoURL = url, username = username, password = password)
+    try:
+        return connection.createDatabase(db_name)
+    except Exception as e:
+        return connection[db_name]
+
+def positive_int(value) :
+    """argparse type for strictly positive integers"""
+    try :
+        value = int(value)
+    except ValueError :
+        raise argparse.ArgumentTypeError("%s is not an integer" % value)
+
+    if value < 1 :
+        raise argparse.ArgumentTypeError("%s is not a positive integer" % value)
+    return value
+
+def get_parser() :
+    parser = argparse.ArgumentParser(prog = "arangoflow", description = "Runs an ArangoFlow pipeline")
+    parser.add_argument("pipeline", help = "python file or module defining the pipeline, optionally followed by :function_name (default: %s)" % DEFAULT_PIPELINE_FUNCTION)
+    parser.add_argument("--name", default = None, help = "name of the project (default: the name of the pipeline file without extension, or the module name)")
+    parser.add_argument("--dry-run", action = "store_true", help = "build the graph in memory and print its shape without touching the database")
+    parser.add_argument("--execution", default = consts.EXECUTION["SYNC"], choices = list(consts.EXECUTION.values()), help = "sync runs processes one at a time, asyncio runs ready processes concurrently on an event loop")
+    parser.add_argument("--max-concurrency", type = positive_int, default = 64, help = "asyncio mode only, maximum number of processes running at the same time")
+    parser.add_argument("--workers", type = positive_int, default = None, help = "asyncio mode only, number of threads running synchronous processes (default: the event loop default)")
+    parser.add_argument("--db-workers", type = positive_int, default = None, help = "asyncio mode only, number of threads doing database writes, separate from --workers")
+    parser.add_argument("--url", default = "http://localhost:8529", help = "url of the ArangoDB server")
+    parser.add_argument("--username", default = "root")
+    parser.add_argument("--password", default = "root")
+    parser.add_argument("--database", default = "ArangoFlow", help = "name of the database")
+    return parser
+
+def main(argv = None) :
+    args = get_parser().parse_args(argv)
+
+    from . import template
+
+    pipeline = load_pipeline(args.pipeline)
+    name = args.name
+    if name is None :
+        name = pipeline_name(args.pipeline)
+
+    if args.dry_run :
+        project = template.FlowProject(None, name)
+        pipeline(project)
+        plan = project.plan()
+        for key in ("nodes", "depth", "width", "estimated_cost") :
+            print("%s: %s" % (key, plan[key]))
+        return 0
+
+    executor, db_executor = None, None
+    if args.execution == consts.EXECUTION["ASYNCIO"] :
+        import concurrent.futures
+        if args.workers is not None :
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers = args.workers)
+        if args.db_workers is not None :
+            db_executor = concurrent.futures.ThreadPoolExecutor(max_workers = args.db_workers, thread_name_prefix = "arangoflow-db")
+
+    db = connect(args.url, args.username, args.password, args.database)
+    try :
+        with template.FlowProject(db, name) as project :
+            pipeline(project)
+            project.run(execution = args.execution, max_concurrency = args.max_concurrency, executor = executor, db_executor = db_executor)
+    finally :
+        for pool in (executor, db_executor) :
+            if pool is not None :
+                pool.shutdown()
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -10,3 +10,8 @@ RANKS = {
 	"NOT_CRITICAL":  "not_critical",
 	"CRITICAL": "critical"
 }
+
+EXECUTION = {
+	"SYNC": "sync",
+	"ASYNCIO": "asyncio"
+}
@@ -1,7 +1,5 @@
 
-import grequests
 from . import consts
-from . import schema
 from . import exceptions
 
         
@@ -39,15 +37,30 @@ class FlowProject(object):
         self.arango_doc["status"] = status
         self.arango_doc.patch()
 
+    async def aupdate_status(self, status, db_executor = None) :
+        """asynchronous version of update_status(), the database write is done in db_executor so it does not block the event loop"""
+        import asyncio
+
+        self.status = status
+        self.arango_doc["status"] = status
+        await asyncio.get_running_loop().run_in_executor(db_executor, self.arango_doc.patch)
+
     def notify_error(self, process) :
         """notify the project that a process has ended with a error. If the process as critical it ends the run"""
         if process.rank == consts.RANKS["CRITICAL"] :
             self.update_status(consts.STATUS["ERROR"]) 
             raise exceptions.CriticalFailure("Process: %s, _id : %s, ended with an error" % (process.name, process.arango_doc._id))
 
+    async def anotify_error(self, process, db_executor = None) :
+        """asynchronous version of notify_error()"""
+        if process.rank == consts.RANKS["CRITICAL"] :
+            await self.aupdate_status(consts.STATUS["ERROR"], db_executor)
+            raise exceptions.CriticalFailure("Process: %s, _id : %s, ended with an error" % (process.name, process.arango_doc._id))
+
     def _db_setup(self):
         """setups the database, creates collections and graph"""
         import time
+        from . import schema # registers the pyArango collection/graph classes used below
         
         for col_name in ("Projects", "Processes", "Pipes", "Results") :
             try :
@@ -90,10 +103,68 @@ class FlowProject(object):
                 e = self.database.graphs["ArangoFlow_graph"].link("Pipes", start_node.arango_doc, desc.arango_doc, {})
                 self._build_traverse(desc)
 
-    def run(self):
-        """build the pipelne graph and runs it"""
+    def plan(self) :
+        """computes the shape of the pipeline in memory without touching the database.
+        Returns a dict with the number of nodes, the depth (longest chain of processes), the width (largest number of processes at the same depth)
+        and the estimated cost (sum of the estimated_cost of all processes)"""
+        import collections
+
+        levels = {}
+        remaining = {}
+        queue = collections.deque()
+        for process in self.processes :
+            remaining[process] = len(process.ancestors)
+            if remaining[process] == 0 :
+                levels[process] = 1
+                queue.append(process)
+
+        while len(queue) > 0 :
+            process = queue.popleft()
+            for desc in set(process.descendants) :
+                levels[desc] = max(levels.get(desc, 0), levels[process] + 1)
+                remaining[desc] -= 1
+                if remaining[desc] == 0 :
+                    queue.append(desc)
+
+        widths = {}
+        for level in levels.values() :
+            widths[level] = widths.get(level, 0) + 1
+
+        return {
+            "nodes": len(self.processes),
+            "depth": max(widths.keys()) if len(widths) > 0 else 0,
+            "width": max(widths.values()) if len(widths) > 0 else 0,
+            "estimated_cost": sum([p.estimated_cost for p in self.processes])
+        }
+
+    def _check_no_running_loop(self, execution) :
+        """run() uses asyncio.run() in asyncio mode, and for coroutine processes in sync mode, which is impossible from inside a running event loop"""
+        import inspect
+
+        if execution == consts.EXECUTION["SYNC"] and not any([inspect.iscoroutinefunction(p.run) for p in self.processes]) :
+            return
+
+        import asyncio
+        try :
+            asyncio.get_running_loop()
+        except RuntimeError :
+            return
+
+        raise RuntimeError("Project %s cannot be run with execution = \"%s\" while an event loop is already running, use run(execution = \"%s\") outside of the loop or await project.arun() instead" % (self.name, execution, consts.EXECUTION["ASYNCIO"]))
+
+    def run(self, execution = consts.EXECUTION["SYNC"], max_concurrency = 64, executor = None, db_executor = None):
+        """build the pipelne graph and runs it. With execution = consts.EXECUTION["ASYNCIO"] the run is done by arun() on a new event loop, see arun() for the other arguments"""
         import time
         
+        if execution not in consts.EXECUTION.values() :
+            raise ValueError("Unknown execution mode: %s, expected one of: %s" % (execution, ', '.join(consts.EXECUTION.values())))
+
+        self._check_no_running_loop(execution)
+
+        if execution == consts.EXECUTION["ASYNCIO"] :
+            import asyncio
+            return asyncio.run(self.arun(max_concurrency, executor, db_executor))
+
         if self.must_setup :
             self._db_setup()
 
@@ -111,12 +182,76 @@ class FlowProject(object):
         self.arango_doc.patch()
         print("done")
 
+    async def arun(self, max_concurrency = 64, executor = None, db_executor = None) :
+        """build the pipeline graph and runs it on the running event loop. Processes whose ancestors are all done are run concurrently,
+        at most max_concurrency at a time. Processes defining an async run() are awaited on the loop, synchronous ones are run in executor
+        (the default executor of the loop if None). Database writes are done in db_executor so they never wait behind synchronous processes
+        (a dedicated thread pool, shut down at the end of the run, if None)"""
+        import concurrent.futures
+
+        if max_concurrency < 1 :
+            raise ValueError("max_concurrency must be at least 1, got: %s" % max_concurrency)
+
+        own_db_executor = db_executor is None
+        if own_db_executor :
+            db_executor = concurrent.futures.ThreadPoolExecutor(thread_name_prefix = "arangoflow-db")
+
+        try :
+            await self._arun_graph(max_concurrency, executor, db_executor)
+        finally :
+            if own_db_executor :
+                db_executor.shutdown(wait = False)
+
+    async def _arun_graph(self, max_concurrency, executor, db_executor) :
+        """the body of arun(), schedules processes as soon as all their ancestors are done"""
+        import asyncio
+        import time
+
+        loop = asyncio.get_running_loop()
+        if self.must_setup :
+            await loop.run_in_executor(db_executor, self._db_setup)
+
+        await self.aupdate_status(consts.STATUS["RUNNING"], db_executor)
+
+        print("building symbolic graph in arangodb...")
+        await loop.run_in_executor(db_executor, self._build_traverse)
+        print("done")
+
+        print("runing the pipeline...")
+        semaphore = asyncio.Semaphore(max_concurrency)
+        scheduled = set(self.inputs)
+        tasks = set([asyncio.ensure_future(inp._arun(semaphore, executor, db_executor)) for inp in self.inputs])
+        try :
+            while len(tasks) > 0 :
+                done, tasks = await asyncio.wait(tasks, return_when = asyncio.FIRST_COMPLETED)
+                for task in done :
+                    process = task.result()
+                    if process.status != consts.STATUS["DONE"] :
+                        continue
+
+                    for desc in process.descendants :
+                        if desc not in scheduled and desc._register_ancestor_join(process) :
+                            scheduled.add(desc)
+                            tasks.add(asyncio.ensure_future(desc._arun(semaphore, executor, db_executor)))
+        except BaseException :
+            for task in tasks :
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions = True)
+            raise
+
+        self.arango_doc["end_date"] = time.time()
+        await self.aupdate_status(consts.STATUS["DONE"], db_executor)
+        print("done")
+
     def __enter__(self):
         return self
 
     def __exit__(self, *args):
         """only updates end time but could handle stuff like pending / unfinished jobs and rollbacks"""
         import time
+        if self.must_setup :
+            return
+
         self.arango_doc["end_date"] = time.time()
         self.arango_doc.patch()
 
@@ -128,7 +263,12 @@ class Process(object):
     be saved in the databse for future reference.
     To use ArangoFlow, users will have to create their own processes by inheriting from this class. The must
     at least define the run() function. The end results of a process are stored in self.result
+    run() can also be defined as a coroutine (async def run()), such processes are run concurrently when the project
+    is run with execution = consts.EXECUTION["ASYNCIO"] (see FlowProject.arun)
+    estimated_cost is a relative estimation of how expensive the process is, it is only used to plan runs (see FlowProject.plan)
     """
+    estimated_cost = 1
+
     def __new__(cls, *args, **kwargs) :
         """Analyse the arguments passed to __init__ finds ancestors (other processes needed for the conputation) and parameters (anything else) """
         import inspect
@@ -251,7 +391,12 @@ class Process(object):
             d.recieve_ancestor_join(self)
     
     def recieve_ancestor_join(self, process) :
-        """receive an end of run notification from an ancestor. If process has at least one of it's ancestors termiate with a error, it will raise a RuntimeError"""
+        """receive an end of run notification from an ancestor and runs self once all ancestors are done"""
+        if self._register_ancestor_join(process) :
+            self._run()
+
+    def _register_ancestor_join(self, process) :
+        """records the end of run of an ancestor. Returns True if all ancestors are done. If process has at least one of it's ancestors termiate with a error, it will raise a RuntimeError"""
         self.ancestors[process]["status"] = process.status
         self.ancestors_finished.add(self.ancestors[process]["argument_name"])
         
@@ -259,9 +404,10 @@ class Process(object):
             self.ancestors_ready.add(self.ancestors[process]["argument_name"])
         
         if len(self.ancestors_ready) == len(self.ancestors) :
-            self._run()
+            return True
         elif len(self.ancestors_finished) == len(self.ancestors) :
             raise RuntimeError("Process upward of self finished with errors: %s" % (self.ancestors_finished - self.ancestors_ready) )
+        return False
 
     def update_status(self, status) :
         """update status in the database"""
@@ -269,6 +415,14 @@ class Process(object):
         self.arango_doc["status"]= status
         self.arango_doc.patch()
 
+    async def aupdate_status(self, status, db_executor = None) :
+        """asynchronous version of update_status(), the database write is done in db_executor so it does not block the event loop"""
+        import asyncio
+
+        self.status = status
+        self.arango_doc["status"] = status
+        await asyncio.get_running_loop().run_in_executor(db_executor, self.arango_doc.patch)
+
     def _save_checkpoint(self) :
         """TODO: save the resulting data on disk so it can reloaded if necessary"""
         pass
@@ -280,8 +434,14 @@ class Process(object):
             self.arango_doc["end_date"] = time.time()
             self.arango_doc.patch()
 
+        import inspect
+
         try:
-            self.result = self.run()
+            if inspect.iscoroutinefunction(self.run) :
+                import asyncio
+                self.result = asyncio.run(self.run())
+            else :
+                self.result = self.run()
         except Exception as e:
             self.update_status(consts.STATUS["ERROR"])
             update_end_date()
@@ -294,8 +454,34 @@ class Process(object):
             update_end_date()
             self.join()
 
+    async def _arun(self, semaphore, executor = None, db_executor = None) :
+        """private asynchronous run function used by FlowProject.arun(). Awaits run() if it is a coroutine function, otherwise runs it in executor.
+        Database writes are done in db_executor. Descendants are not notified, scheduling them is left to the project. Returns self"""
+        import asyncio
+        import inspect
+        import time
+
+        async with semaphore :
+            try:
+                if inspect.iscoroutinefunction(self.run) :
+                    self.result = await self.run()
+                else :
+                    self.result = await asyncio.get_running_loop().run_in_executor(executor, self.run)
+            except Exception as e:
+                self.arango_doc["end_date"] = time.time()
+                await self.aupdate_status(consts.STATUS["ERROR"], db_executor)
+                await self.project.anotify_error(self, db_executor)
+            else :
+                if self.checkpoint:
+                    self._save_checkpoint()
+
+                self.arango_doc["end_date"] = time.time()
+                await self.aupdate_status(consts.STATUS["DONE"], db_executor)
+
+        return self
+
     def run(self) :
-        """the function that users must redefine, must runs and return the output"""
+        """the function that users must redefine, must runs and return the output. Can be defined as a coroutine function"""
         raise NotImplementedError("Must be implemented in child")
 
     def __call__(self) :
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# makes the package importable when the tests are run with a plain `pytest`
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -69,6 +69,26 @@ class SerializeMatrix(template.Result):
         numpy.savetxt(self.filename, self.previous.result)
         return True
 
+def pipeline(project) :
+    """creates the processes of the demo, can also be run with: arangoflow demo.py"""
+    mat = RandomMatrix(project, size = (10, 10))
+    SerializeMatrix(project, mat, "random.txt")
+    fmat = Threshold(project, previous = mat, threshold=0.5)
+    SerializeMatrix(project, fmat, "threshold.txt")
+    nmat = Normalize(project, previous = fmat)
+    SerializeMatrix(project, nmat, "normalize.txt")
+
+    mat2 = RandomMatrix(project, size = (10, 10))
+    SerializeMatrix(project, mat2, "random2.txt")
+    fmat2 = Threshold(project, previous = mat2, threshold=0.5)
+    SerializeMatrix(project, fmat2, "threshold2.txt")
+    smat2 = Scale(project, previous = fmat2, scale=10)
+    SerializeMatrix(project, smat2, "Scale2.txt")
+
+    con = Append(project, nmat, smat2, axis = 1)
+    SerializeMatrix(project, con, "Stack.txt")
+    norm2 = Normalize(project, con)
+
 if __name__ == '__main__':
     DB_URL = "http://localhost:8529"
     DB_USERNAME = "root"
@@ -84,24 +104,7 @@ if __name__ == '__main__':
         db = connection[DB_NAME]
     
     with template.FlowProject(db, "test") as project :
-        mat = RandomMatrix(project, size = (10, 10))
-        SerializeMatrix(project, mat, "random.txt")
-        fmat = Threshold(project, previous = mat, threshold=0.5)
-        SerializeMatrix(project, fmat, "threshold.txt")
-        nmat = Normalize(project, previous = fmat)
-        SerializeMatrix(project, nmat, "normalize.txt")
-
-        mat2 = RandomMatrix(project, size = (10, 10))
-        SerializeMatrix(project, mat2, "random2.txt")
-        fmat2 = Threshold(project, previous = mat2, threshold=0.5)
-        SerializeMatrix(project, fmat2, "threshold2.txt")
-        smat2 = Scale(project, previous = fmat2, scale=10)
-        SerializeMatrix(project, smat2, "Scale2.txt")
-
-        con = Append(project, nmat, smat2, axis = 1)
-        SerializeMatrix(project, con, "Stack.txt")
-        norm2 = Normalize(project, con)
-
+        pipeline(project)
         project.run()
 
         # print(mat.result)
@@ -24,11 +24,12 @@ setup(
     classifiers=[
         'License :: OSI Approved :: Apache Software License',
 
-        'Programming Language :: Python :: 2.7',
         'Programming Language :: Python :: 3',
     ],
 
-    install_requires=['grequests', "pyArango"],
+    python_requires='>=3.7',
+
+    install_requires=["pyArango"],
 
     keywords='',
 
@@ -36,7 +37,7 @@ setup(
 
     entry_points={
         'console_scripts': [
-            'sample=sample:main',
+            'arangoflow=ArangoFlow.cli:main',
         ],
     },
 )
@@ -0,0 +1,205 @@
+import asyncio
+import concurrent.futures
+import time
+
+import pytest
+
+from ArangoFlow import consts
+from ArangoFlow import exceptions
+from ArangoFlow import template
+
+class FakeDocument(dict):
+    """in-memory stand-in for a pyArango document, records the time of every write"""
+    count = 0
+
+    def __init__(self):
+        super(FakeDocument, self).__init__()
+        FakeDocument.count += 1
+        self._id = "Fake/%s" % FakeDocument.count
+        self.writes = []
+
+    def set(self, values) :
+        self.update(values)
+
+    def save(self) :
+        self.writes.append((time.perf_counter(), self.get("status")))
+
+    def patch(self) :
+        time.sleep(0.005)
+        self.writes.append((time.perf_counter(), self.get("status")))
+
+class FakeCollection(object):
+    def createDocument(self) :
+        return FakeDocument()
+
+    def truncate(self) :
+        pass
+
+class FakeGraph(object):
+    def link(self, *args) :
+        pass
+
+class FakeDatabase(dict):
+    """in-memory stand-in for a pyArango database"""
+    def __init__(self):
+        super(FakeDatabase, self).__init__()
+        for col_name in ("Projects", "Processes", "Pipes", "Results") :
+            self[col_name] = FakeCollection()
+        self.graphs = {"ArangoFlow_graph": FakeGraph()}
+
+    def createCollection(self, name) :
+        pass
+
+    def createGraph(self, name) :
+        pass
+
+def make_project(name) :
+    """project on a fake database. The database setup is skipped because it registers the pyArango schema"""
+    project = template.FlowProject(FakeDatabase(), name)
+    project.arango_doc = FakeDocument()
+    project.must_setup = False
+    return project
+
+class Fetch(template.Process):
+    """asynchronously fetches a value"""
+    in_flight = 0
+    max_in_flight = 0
+
+    def __init__(self, project, value):
+        super(Fetch, self).__init__(project)
+        self.value = value
+
+    async def run(self) :
+        Fetch.in_flight += 1
+        Fetch.max_in_flight = max(Fetch.max_in_flight, Fetch.in_flight)
+        try :
+            await asyncio.sleep(0.02)
+        finally :
+            Fetch.in_flight -= 1
+        return self.value
+
+class Add(template.Process):
+    """adds the results of two processes"""
+    def __init__(self, project, left, right):
+        super(Add, self).__init__(project)
+        self.left = left
+        self.right = right
+
+    def run(self) :
+        return self.left() + self.right()
+
+class Block(template.Process):
+    """blocking synchronous process"""
+    def __init__(self, project, duration):
+        super(Block, self).__init__(project)
+        self.duration = duration
+        self.start = None
+
+    def run(self) :
+        self.start = time.perf_counter()
+        time.sleep(self.duration)
+        return self.duration
+
+class Slow(template.Process):
+    """asynchronous process that takes too long to finish before a failure"""
+    cancelled = False
+
+    def __init__(self, project, duration):
+        super(Slow, self).__init__(project)
+        self.duration = duration
+
+    async def run(self) :
+        try :
+            await asyncio.sleep(self.duration)
+        except asyncio.CancelledError :
+            Slow.cancelled = True
+            raise
+        return self.duration
+
+class Fail(template.Process):
+    """critical process that fails"""
+    def __init__(self, project, previous):
+        super(Fail, self).__init__(project)
+        self.previous = previous
+
+    async def run(self) :
+        raise ValueError("failure")
+
+def build_diamonds(project, width) :
+    """width fetches joined two by two, then joined again with the first fetch (diamond joins)"""
+    fetches = [Fetch(project, i) for i in range(width)]
+    adds = [Add(project, fetches[i], fetches[i+1]) for i in range(width - 1)]
+    joins = [Add(project, adds[i], fetches[0]) for i in range(width - 1)]
+    return fetches + adds + joins
+
+def test_asyncio_results_match_sync() :
+    results = {}
+    for execution in consts.EXECUTION.values() :
+        project = make_project("diamonds")
+        processes = build_diamonds(project, 10)
+        project.run(execution = execution, max_concurrency = 4)
+        assert project.status == consts.STATUS["DONE"]
+        assert set([p.status for p in processes]) == set([consts.STATUS["DONE"]])
+        results[execution] = [p.result for p in processes]
+
+    assert results[consts.EXECUTION["SYNC"]] == results[consts.EXECUTION["ASYNCIO"]]
+
+def test_asyncio_concurrency_limit() :
+    Fetch.max_in_flight = 0
+    project = make_project("limit")
+    for i in range(20) :
+        Fetch(project, i)
+
+    project.run(execution = consts.EXECUTION["ASYNCIO"], max_concurrency = 3)
+    assert Fetch.max_in_flight == 3
+
+@pytest.mark.parametrize("max_concurrency", [0, -1])
+def test_asyncio_invalid_concurrency(max_concurrency) :
+    project = make_project("invalid")
+    Fetch(project, 1)
+    with pytest.raises(ValueError) :
+        project.run(execution = consts.EXECUTION["ASYNCIO"], max_concurrency = max_concurrency)
+
+def test_asyncio_critical_failure_cancels_pending() :
+    Slow.cancelled = False
+    project = make_project("failure")
+    slow = Slow(project, 10)
+    Fail(project, Fetch(project, 1))
+
+    start = time.perf_counter()
+    with pytest.raises(exceptions.CriticalFailure) :
+        project.run(execution = consts.EXECUTION["ASYNCIO"])
+
+    assert time.perf_counter() - start < 5
+    assert Slow.cancelled
+    assert project.status == consts.STATUS["ERROR"]
+    assert slow.status == consts.STATUS["PENDING"]
+
+def test_asyncio_db_writes_do_not_wait_for_sync_processes() :
+    project = make_project("executors")
+    blocks = [Block(project, 0.3) for i in range(3)]
+    fetches = [Fetch(project, i) for i in range(20)]
+
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers = 1)
+    try :
+        project.run(execution = consts.EXECUTION["ASYNCIO"], executor = executor)
+    finally :
+        executor.shutdown()
+
+    # the single worker runs the blocks one after the other, the fetches must be written before the second one starts
+    second_block_start = sorted([b.start for b in blocks])[1]
+    for f in fetches :
+        done_writes = [t for t, status in f.arango_doc.writes if status == consts.STATUS["DONE"]]
+        assert done_writes[-1] < second_block_start
+
+@pytest.mark.parametrize("execution", consts.EXECUTION.values())
+def test_run_with_running_loop_raises(execution) :
+    project = make_project("running loop")
+    fetch = Fetch(project, 1)
+
+    async def main() :
+        project.run(execution = execution)
+
+    with pytest.raises(RuntimeError, match = "arun") :
+        asyncio.run(main())
+    assert fetch.status == consts.STATUS["PENDING"]
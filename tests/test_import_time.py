@@ -0,0 +1,32 @@
+"""Guards the startup budget: importing the package must not pull in heavy dependencies"""
+
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("pyArango", "gevent", "grequests", "asyncio")
+IMPORT_BUDGET = 1.0 # seconds, coarse on purpose
+
+def import_in_subprocess(module_name) :
+    """imports module_name in a fresh interpreter and returns the heavy modules loaded and the import time"""
+    code = """
+import json, sys, time
+start = time.perf_counter()
+import %s
+duration = time.perf_counter() - start
+print(json.dumps({"loaded": [m for m in %r if m in sys.modules], "duration": duration}))
+""" % (module_name, HEAVY_MODULES)
+    output = subprocess.check_output([sys.executable, "-c", code], cwd = ROOT)
+    return json.loads(output.decode("utf-8"))
+
+def test_template_import_is_light() :
+    res = import_in_subprocess("ArangoFlow.template")
+    assert res["loaded"] == []
+    assert res["duration"] < IMPORT_BUDGET
+
+def test_cli_import_is_light() :
+    res = import_in_subprocess("ArangoFlow.cli")
+    assert res["loaded"] == []
+    assert res["duration"] < IMPORT_BUDGET
@@ -0,0 +1,70 @@
+from ArangoFlow import template
+
+class Source(template.Process):
+    """source"""
+    estimated_cost = 3
+    def __init__(self, project, value):
+        super(Source, self).__init__(project)
+        self.value = value
+
+    def run(self) :
+        return self.value
+
+class Step(template.Process):
+    """step"""
+    def __init__(self, project, previous):
+        super(Step, self).__init__(project)
+        self.previous = previous
+
+    def run(self) :
+        return self.previous()
+
+class Join(template.Process):
+    """join"""
+    def __init__(self, project, left, right):
+        super(Join, self).__init__(project)
+        self.left = left
+        self.right = right
+
+    def run(self) :
+        return self.left() + self.right()
+
+def test_plan_shape() :
+    project = template.FlowProject(None, "plan")
+    a = Source(project, 1)
+    b = Source(project, 2)
+    left = Step(project, a)
+    Step(project, a)
+    right = Step(project, b)
+    Join(project, left, right)
+
+    assert project.plan() == {"nodes": 6, "depth": 3, "width": 3, "estimated_cost": 10}
+
+def test_plan_empty() :
+    project = template.FlowProject(None, "plan")
+    assert project.plan() == {"nodes": 0, "depth": 0, "width": 0, "estimated_cost": 0}
+
+def test_plan_does_not_recurse() :
+    """plan must work on chains deeper than the recursion limit"""
+    import sys
+
+    project = template.FlowProject(None, "plan")
+    previous = Source(project, 1)
+    length = 300
+    for i in range(length - 1) :
+        previous = Step(project, previous)
+    project.processes.reverse() # worst case order for a recursive implementation
+
+    frame, stack_depth = sys._getframe(), 0
+    while frame is not None :
+        frame, stack_depth = frame.f_back, stack_depth + 1
+
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(stack_depth + length // 2)
+    try :
+        plan = project.plan()
+    finally :
+        sys.setrecursionlimit(limit)
+
+    assert plan["depth"] == length
+    assert plan["width"] == 1